@@ -9,13 +9,16 @@ import os
 import sys
 import socket
 import struct
+import ctypes
+import errno
 import logging
 import multiprocessing
 import argparse
 import platform
-import subprocess
 import signal
 import queue
+import selectors
+import itertools
 import ipaddress
 from configparser import ConfigParser
 from time import sleep
@@ -35,6 +38,35 @@ REMOTE_PEERS_DEFAULT = 1
 # default relay port base values, to be used if otherwise unspecified
 SERVER_RELAY_BASE_PORT_DEFAULT = 23000
 CLIENT_RELAY_BASE_PORT_DEFAULT = 23100
+# maximum number of packets handled by a single recvmmsg/sendmmsg call
+PACKET_BATCH_SIZE = 64
+# maximum number of resolved source addresses cached by a packet batch
+ADDRESS_CACHE_SIZE = 1024
+# number of dropped packets in between queue capacity error messages
+PACKET_DROP_LOG_INTERVAL = 1000
+# (typical) CPU cache line size in bytes
+CACHE_LINE_SIZE = 64
+# interval in seconds at which the server keep alive loop checks for a connected remote peer
+KEEP_ALIVE_HALT_POLL_INTERVAL = 0.05
+
+# recvmmsg/sendmmsg are only available on Linux, so batched packet
+# transfers will fall back to one packet at a time everywhere else
+if platform.system() == 'Linux':
+    try:
+        LIBC = ctypes.CDLL(None, use_errno=True)
+        LIBC.recvmmsg.restype = ctypes.c_int
+        LIBC.sendmmsg.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        LIBC = None
+else:
+    LIBC = None
+
+# makes receive calls return the real size of truncated packets,
+# which is only supported for UDP sockets on Linux
+if platform.system() == 'Linux':
+    MSG_TRUNC = socket.MSG_TRUNC
+else:
+    MSG_TRUNC = 0
 
 def sigterm_handler(signum, frame):
     # exceptions may happen here as well due to logger syncronization mayhem on shutdown
@@ -54,27 +86,145 @@ def sigint_handler(signum, frame):
 
     raise SystemExit(0)
 
+def set_process_affinity(process, cpu_core):
+    '''Pins an already started worker process to the specified CPU core'''
+
+    if cpu_core is not None:
+        try:
+            os.sched_setaffinity(process.pid, {cpu_core})
+        except OSError:
+            logger.warning(f'WU >>> Unable to pin process {process.pid} to CPU core {cpu_core}.')
+
+def get_interface_ip(interface):
+    '''Queries the IPv4 address of a network interface (Linux only)'''
+
+    # only available on Unix-like platforms
+    import fcntl
+
+    intf = bytes(interface, 'utf-8')
+    # interface names are limited to IFNAMSIZ (16) bytes, including the null terminator
+    if len(intf) > 15:
+        raise OSError(errno.ENODEV, os.strerror(errno.ENODEV))
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as query_socket:
+        # 0x8915 = SIOCGIFADDR, which expects a struct ifreq (padded to 256 bytes here)
+        ifreq = fcntl.ioctl(query_socket.fileno(), 0x8915, struct.pack('256s', intf))
+
+    # the address is returned as a struct sockaddr_in, which follows the interface name
+    return socket.inet_ntoa(ifreq[20:24])
+
+def get_interface_numa_cores(interface):
+    '''Determines the NUMA node of a network interface and its local CPU cores (Linux only)'''
+
+    try:
+        with open(f'/sys/class/net/{interface}/device/numa_node') as numa_node_file:
+            numa_node = int(numa_node_file.read())
+        # virtual interfaces and non-NUMA systems report -1
+        if numa_node < 0:
+            return None
+
+        with open(f'/sys/devices/system/node/node{numa_node}/cpulist') as cpu_list_file:
+            cpu_list = cpu_list_file.read().strip()
+
+        # the CPU core list is made up of ranges, e.g. 0-3,8-11
+        numa_cores = set()
+        for cpu_range in cpu_list.split(','):
+            first_core, _, last_core = cpu_range.partition('-')
+            numa_cores.update(range(int(first_core), int(last_core or first_core) + 1))
+    except (OSError, ValueError):
+        return None
+
+    return numa_node, numa_cores
+
+def pack_peer_address(addr):
+    '''Packs an (ip, port) address tuple into a single integer value'''
+
+    # '!' (byte order) = network/big-endian, 'L' (type) = unsigned long
+    return (struct.unpack('!L', socket.inet_aton(addr[0]))[0] << 16) | addr[1]
+
+def unpack_peer_address(value):
+    '''Unpacks an integer value into an (ip, port) address tuple'''
+
+    return (socket.inet_ntoa(struct.pack('!L', value >> 16)), value & 0xFFFF)
+
+# only the first capped socket buffer of a process is reported as a warning,
+# since all other sockets (and any channel resets) will run into the same limits
+socket_buffer_cap_reported = False
+
+def set_socket_options(sock, peer, wookiee_constants):
+    '''Applies the configured kernel buffer sizes and busy polling to a UDP socket'''
+
+    global socket_buffer_cap_reported
+
+    # the kernel will silently cap buffer sizes to net.core.rmem_max/wmem_max
+    if wookiee_constants.SOCKET_BUFFER_SIZE:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, wookiee_constants.SOCKET_BUFFER_SIZE)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, wookiee_constants.SOCKET_BUFFER_SIZE)
+        except OSError:
+            logger.warning(f'WU P{peer} >>> Unable to set socket buffer sizes.')
+        else:
+            # the socket module doesn't expose SO_RCVBUFFORCE/SO_SNDBUFFORCE, which are 33/32 on Linux
+            for buffer_option, force_option, buffer_name, sysctl_name in ((socket.SO_RCVBUF, getattr(socket, 'SO_RCVBUFFORCE', 33),
+                                                                           'receive', 'net.core.rmem_max'),
+                                                                          (socket.SO_SNDBUF, getattr(socket, 'SO_SNDBUFFORCE', 32),
+                                                                           'send', 'net.core.wmem_max')):
+                buffer_size = sock.getsockopt(socket.SOL_SOCKET, buffer_option)
+                # Linux reports double the set value, to account for bookkeeping overhead
+                if platform.system() == 'Linux':
+                    buffer_size //= 2
+
+                    # processes with CAP_NET_ADMIN are allowed to go past the sysctl limits
+                    if buffer_size < wookiee_constants.SOCKET_BUFFER_SIZE:
+                        try:
+                            sock.setsockopt(socket.SOL_SOCKET, force_option, wookiee_constants.SOCKET_BUFFER_SIZE)
+                            buffer_size = sock.getsockopt(socket.SOL_SOCKET, buffer_option) // 2
+                        # expected without CAP_NET_ADMIN, in which case the cap is reported below
+                        except OSError:
+                            pass
+
+                    if buffer_size < wookiee_constants.SOCKET_BUFFER_SIZE:
+                        buffer_cap_message = (f'WU P{peer} >>> Socket {buffer_name} buffer size has been capped to {buffer_size} bytes. '
+                                              f'Raise {sysctl_name} to allow for bigger buffers.')
+
+                        if socket_buffer_cap_reported:
+                            logger.debug(buffer_cap_message)
+                        else:
+                            logger.warning(buffer_cap_message)
+                            socket_buffer_cap_reported = True
+
+                logger.debug(f'WU P{peer} >>> Socket {buffer_name} buffer size: {buffer_size}')
+
+    if wookiee_constants.SOCKET_BUSY_POLL:
+        if platform.system() == 'Linux':
+            try:
+                # the socket module doesn't expose SO_BUSY_POLL, which is 46 on Linux
+                sock.setsockopt(socket.SOL_SOCKET, getattr(socket, 'SO_BUSY_POLL', 46),
+                                wookiee_constants.SOCKET_BUSY_POLL)
+            except OSError:
+                logger.warning(f'WU P{peer} >>> Unable to enable busy polling. Values above net.core.busy_read require CAP_NET_ADMIN.')
+        else:
+            logger.warning(f'WU P{peer} >>> Busy polling is only available on Linux.')
+
 class WookieeConstants:
     '''Shared static and runtime constants'''
     
     ############################ WOOKIEE MODE ############################
     WOOKIEE_MODE_CLIENT = b'0'
     WOOKIEE_MODE_SERVER = b'1'
-    # [0] = client/server, [1] = source/destination, [2] = receive/relay #
-    WOOKIEE_MODE_NAMES = { b'000': 'client-source-receive',
-                           b'001': 'client-source-relay',
-                           b'010': 'client-destination-receive',
-                           b'011': 'client-destination-relay',
+    # [0] = client/server, [1] = source/destination, [2] = receive/relay/forward #
+    WOOKIEE_MODE_NAMES = { b'002': 'client-source-forward',
+                           b'012': 'client-destination-forward',
                            b'100': 'server-source-receive',
                            b'101': 'server-source-relay',
-                           b'110': 'server-destination-receive',
-                           b'111': 'server-destination-relay' }
+                           b'112': 'server-destination-forward' }
     ######################################################################
 
     ##################### WOOKIEE RUNTIME CONSTANTS ######################
     def __init__ (self, LOGGING_LEVEL, RECEIVE_BUFFER_SIZE, CLIENT_CONNECTION_TIMEOUT,
                   SERVER_CONNECTION_TIMEOUT, SERVER_PEER_CONNECTION_TIMEOUT,
-                  KEEP_ALIVE_PING_INTERVAL, KEEP_ALIVE_PING_TIMEOUT):
+                  KEEP_ALIVE_PING_INTERVAL, KEEP_ALIVE_PING_TIMEOUT,
+                  SOCKET_BUFFER_SIZE, SOCKET_BUSY_POLL):
         self.LOGGING_LEVEL = LOGGING_LEVEL
         self.RECEIVE_BUFFER_SIZE = RECEIVE_BUFFER_SIZE
         self.CLIENT_CONNECTION_TIMEOUT = CLIENT_CONNECTION_TIMEOUT
@@ -82,15 +232,312 @@ class WookieeConstants:
         self.SERVER_PEER_CONNECTION_TIMEOUT = SERVER_PEER_CONNECTION_TIMEOUT
         self.KEEP_ALIVE_PING_INTERVAL = KEEP_ALIVE_PING_INTERVAL
         self.KEEP_ALIVE_PING_TIMEOUT = KEEP_ALIVE_PING_TIMEOUT
+        self.SOCKET_BUFFER_SIZE = SOCKET_BUFFER_SIZE
+        self.SOCKET_BUSY_POLL = SOCKET_BUSY_POLL
     ######################################################################
 
+class IOVec(ctypes.Structure):
+    '''struct iovec'''
+
+    _fields_ = [('iov_base', ctypes.c_void_p),
+                ('iov_len', ctypes.c_size_t)]
+
+class SockAddrIn(ctypes.Structure):
+    '''struct sockaddr_in (Linux layout)'''
+
+    # sin_port and sin_addr are stored in network byte order
+    _fields_ = [('sin_family', ctypes.c_ushort),
+                ('sin_port', ctypes.c_ushort),
+                ('sin_addr', ctypes.c_uint32),
+                ('sin_zero', ctypes.c_ubyte * 8)]
+
+class MsgHdr(ctypes.Structure):
+    '''struct msghdr'''
+
+    _fields_ = [('msg_name', ctypes.c_void_p),
+                ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(IOVec)),
+                ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p),
+                ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class MMsgHdr(ctypes.Structure):
+    '''struct mmsghdr'''
+
+    _fields_ = [('msg_hdr', MsgHdr),
+                ('msg_len', ctypes.c_uint)]
+
+class PacketStats(ctypes.Structure):
+    '''Packet statistics of a remote peer (or of the server handler)'''
+
+    # every field is only ever updated by a single worker process,
+    # so there's no need to lock any of the shared memory entries
+    _fields_ = [('max_packet_size', ctypes.c_uint),
+                ('source_packet_count', ctypes.c_ulong),
+                ('destination_packet_count', ctypes.c_ulong),
+                ('dropped_packet_count', ctypes.c_ulong)]
+
+class SharedFlag:
+    '''Lock-free stand-in for a multiprocessing.Event that is only ever polled'''
+
+    def __init__(self):
+        # 'B' = unsigned char, which gets read/written as a single byte
+        self.flag = multiprocessing.RawValue('B', 0)
+
+    def is_set(self):
+        return self.flag.value == 1
+
+    def set(self):
+        self.flag.value = 1
+
+    def clear(self):
+        self.flag.value = 0
+
+class PacketBatch:
+    '''Handles batched packet transfers using preallocated buffers'''
+
+    def __init__(self, batch_size, buffer_size):
+        # fall back to transferring one packet at a time if recvmmsg/sendmmsg are unavailable
+        self.batching = LIBC is not None
+        self.batch_size = batch_size if self.batching else 1
+        self.buffer_size = buffer_size
+
+        # a single contiguous buffer is split into batch_size packet slots
+        self.buffer = bytearray(self.batch_size * self.buffer_size)
+        self.buffer_view = memoryview(self.buffer)
+        # single packet receives (the fallback) will always reuse the first slot
+        self.receive_view = self.buffer_view[:self.buffer_size]
+        self.packet_sizes = [0] * self.batch_size
+        # source addresses are only resolved on demand, see addresses()
+        self.packet_addrs = [None] * self.batch_size
+
+        if self.batching:
+            # keep a reference to the exported buffer for as long as the batch is in use
+            self.buffer_ref = ctypes.c_char.from_buffer(self.buffer)
+            buffer_address = ctypes.addressof(self.buffer_ref)
+
+            self.receive_iovecs = (IOVec * self.batch_size)()
+            self.receive_addrs = (SockAddrIn * self.batch_size)()
+            self.receive_addrs_address = ctypes.addressof(self.receive_addrs)
+            # maps raw sockaddr_in port/address bytes to (ip, port) tuples
+            self.address_cache = {}
+            self.receive_msgs = (MMsgHdr * self.batch_size)()
+            self.send_iovecs = (IOVec * self.batch_size)()
+            self.send_addr = SockAddrIn()
+            self.send_msgs = (MMsgHdr * self.batch_size)()
+            # the address currently packed into send_addr
+            self.send_oaddr = None
+
+            for slot in range(self.batch_size):
+                slot_address = buffer_address + slot * self.buffer_size
+
+                self.receive_iovecs[slot].iov_base = slot_address
+                self.receive_iovecs[slot].iov_len = self.buffer_size
+                self.receive_msgs[slot].msg_hdr.msg_name = ctypes.addressof(self.receive_addrs[slot])
+                self.receive_msgs[slot].msg_hdr.msg_namelen = ctypes.sizeof(SockAddrIn)
+                self.receive_msgs[slot].msg_hdr.msg_iov = ctypes.pointer(self.receive_iovecs[slot])
+                self.receive_msgs[slot].msg_hdr.msg_iovlen = 1
+
+                # all packets in a batch will be sent to the same address
+                self.send_iovecs[slot].iov_base = slot_address
+                self.send_msgs[slot].msg_hdr.msg_name = ctypes.addressof(self.send_addr)
+                self.send_msgs[slot].msg_hdr.msg_namelen = ctypes.sizeof(SockAddrIn)
+                self.send_msgs[slot].msg_hdr.msg_iov = ctypes.pointer(self.send_iovecs[slot])
+                self.send_msgs[slot].msg_hdr.msg_iovlen = 1
+
+    def packet(self, slot):
+        '''Returns a view of the packet stored in the specified slot'''
+
+        offset = slot * self.buffer_size
+        return self.buffer_view[offset:offset + self.packet_sizes[slot]]
+
+    def slot(self, slot):
+        '''Returns a (writable) view of the entire specified slot'''
+
+        offset = slot * self.buffer_size
+        return self.buffer_view[offset:offset + self.buffer_size]
+
+    def receive(self, isocket):
+        '''Receives up to batch_size (already pending) packets and returns their count'''
+
+        # note that the sizes of truncated packets will exceed buffer_size on Linux
+
+        if self.batching:
+            packet_count = LIBC.recvmmsg(isocket.fileno(), self.receive_msgs,
+                                         self.batch_size, socket.MSG_DONTWAIT | MSG_TRUNC, None)
+
+            if packet_count < 0:
+                error_code = ctypes.get_errno()
+                # nothing left to receive or interrupted by a signal
+                if error_code in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                    return 0
+                elif error_code == errno.ENOSYS:
+                    logger.warning('WU >>> recvmmsg is not supported. Falling back to single packet transfers.')
+                    self.batching = False
+                    self.batch_size = 1
+                else:
+                    raise OSError(error_code, os.strerror(error_code))
+
+            else:
+                for slot in range(packet_count):
+                    self.packet_sizes[slot] = self.receive_msgs[slot].msg_len
+
+                return packet_count
+
+        self.packet_sizes[0], self.packet_addrs[0] = isocket.recvfrom_into(self.receive_view, 0, MSG_TRUNC)
+
+        return 1
+
+    def addresses(self, packet_count):
+        '''Returns a list holding the source (ip, port) addresses of the first packet_count received packets'''
+
+        if self.batching:
+            sockaddr_size = ctypes.sizeof(SockAddrIn)
+            receive_addrs = ctypes.string_at(self.receive_addrs_address, packet_count * sockaddr_size)
+
+            for slot in range(packet_count):
+                offset = slot * sockaddr_size
+                # sin_port and sin_addr, both in network byte order
+                address_key = receive_addrs[offset + 2:offset + 8]
+                address = self.address_cache.get(address_key)
+
+                if address is None:
+                    # don't let stray senders grow the cache indefinitely
+                    if len(self.address_cache) >= ADDRESS_CACHE_SIZE:
+                        self.address_cache.clear()
+                    address = (socket.inet_ntoa(address_key[2:]), int.from_bytes(address_key[:2], 'big'))
+                    self.address_cache[address_key] = address
+
+                self.packet_addrs[slot] = address
+
+        return self.packet_addrs
+
+    def send(self, osocket, packet_count, oaddr):
+        '''Sends the first packet_count packets to oaddr and returns the number of sent packets'''
+
+        if self.batching:
+            if oaddr != self.send_oaddr:
+                self.send_addr.sin_family = socket.AF_INET
+                self.send_addr.sin_port = socket.htons(oaddr[1])
+                # '=' (byte order) = native, since inet_aton already yields network byte order
+                self.send_addr.sin_addr = struct.unpack('=L', socket.inet_aton(oaddr[0]))[0]
+                self.send_oaddr = oaddr
+
+            for slot in range(packet_count):
+                self.send_iovecs[slot].iov_len = self.packet_sizes[slot]
+
+            sent_count = 0
+
+            while sent_count < packet_count:
+                result = LIBC.sendmmsg(osocket.fileno(),
+                                       ctypes.byref(self.send_msgs, sent_count * ctypes.sizeof(MMsgHdr)),
+                                       packet_count - sent_count, 0)
+
+                if result < 0:
+                    error_code = ctypes.get_errno()
+                    if error_code == errno.EINTR:
+                        continue
+                    # drop the rest of the batch if the send buffer is full, as would any UDP stack
+                    elif error_code in (errno.EAGAIN, errno.EWOULDBLOCK):
+                        logger.debug(f'WU >>> Send buffer is full. Dropped {packet_count - sent_count} packet(s).')
+                        return sent_count
+                    elif error_code == errno.ENOSYS:
+                        logger.warning('WU >>> sendmmsg is not supported. Falling back to single packet transfers.')
+                        self.batching = False
+                        self.batch_size = 1
+                        break
+                    else:
+                        raise OSError(error_code, os.strerror(error_code))
+
+                sent_count += result
+
+            if self.batching:
+                return sent_count
+
+        else:
+            sent_count = 0
+
+        for slot in range(sent_count, packet_count):
+            osocket.sendto(self.packet(slot), oaddr)
+
+        return packet_count
+
+class PacketQueue:
+    '''Single producer, single consumer ring of shared memory packet slots'''
+
+    def __init__(self, queue_size, slot_size):
+        self.slot_count = queue_size
+        self.slot_size = slot_size
+
+        self.buffer = multiprocessing.RawArray(ctypes.c_char, self.slot_count * self.slot_size)
+        # 'I' = unsigned int
+        self.packet_sizes = multiprocessing.RawArray('I', self.slot_count)
+        # track filled and vacant slots, so that both sides can
+        # block when needed without ever locking the ring itself
+        self.filled_slots = multiprocessing.Semaphore(0)
+        self.vacant_slots = multiprocessing.Semaphore(self.slot_count)
+        # the ring head is only ever used by the (single) producer process, however the
+        # tail needs to be shared, since the consumer process gets restarted on channel resets
+        self.head = 0
+        # 'I' = unsigned int, with the tail placed in the middle of three cache lines, so that its
+        # (per packet) updates can't invalidate cache lines holding any other shared memory values
+        self.tail = multiprocessing.RawArray('I', 3 * CACHE_LINE_SIZE // ctypes.sizeof(ctypes.c_uint))
+        self.tail_index = CACHE_LINE_SIZE // ctypes.sizeof(ctypes.c_uint)
+        # will be set up on first use, since memoryviews can't be pickled
+        self.buffer_view = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['buffer_view'] = None
+        return state
+
+    def put(self, data, block=True, timeout=None):
+        '''Copies a packet into the slot at the head of the ring'''
+
+        if not self.vacant_slots.acquire(block, timeout):
+            raise queue.Full
+
+        if self.buffer_view is None:
+            self.buffer_view = memoryview(self.buffer).cast('B')
+
+        slot = self.head
+        packet_size = len(data)
+        offset = slot * self.slot_size
+        self.buffer_view[offset:offset + packet_size] = data
+        self.packet_sizes[slot] = packet_size
+        self.head = (slot + 1) % self.slot_count
+
+        self.filled_slots.release()
+
+    def put_nowait(self, data):
+        self.put(data, False)
+
+    def get_into(self, buffer, block=True, timeout=None):
+        '''Copies the packet at the tail of the ring into buffer and returns its size'''
+
+        if not self.filled_slots.acquire(block, timeout):
+            raise queue.Empty
+
+        if self.buffer_view is None:
+            self.buffer_view = memoryview(self.buffer).cast('B')
+
+        slot = self.tail[self.tail_index]
+        packet_size = self.packet_sizes[slot]
+        offset = slot * self.slot_size
+        buffer[:packet_size] = self.buffer_view[offset:offset + packet_size]
+        self.tail[self.tail_index] = (slot + 1) % self.slot_count
+
+        self.vacant_slots.release()
+
+        return packet_size
+
 class ServerHandler:
     '''Handles inbound connections for all remote peers'''
 
     def __init__(self, peers, intf, local_ip, source_port,
                  remote_peer_event_list, source_queue_list,
-                 remote_peer_addr_array, remote_peer_port_array,
-                 max_packet_size, source_packet_count, wookiee_constants):
+                 remote_peer_addr_array, packet_stats, cpu_core, wookiee_constants):
         # the server will have a single source-receive queue worker process
         self.peer = 0
 
@@ -103,10 +550,9 @@ class ServerHandler:
         self.remote_peer_event_list = remote_peer_event_list
         self.source_queue_list = source_queue_list
         self.remote_peer_addr_array = remote_peer_addr_array
-        self.remote_peer_port_array = remote_peer_port_array
 
-        self.max_packet_size = max_packet_size
-        self.source_packet_count = source_packet_count
+        self.packet_stats = packet_stats
+        self.cpu_core = cpu_core
 
         self.wookiee_constants = wookiee_constants
 
@@ -133,9 +579,12 @@ class ServerHandler:
             raise SystemExit(16)
         #######################################################################
 
+        set_socket_options(self.server_socket, self.peer, self.wookiee_constants)
+
         self.child_proc_started_event = multiprocessing.Event()
         self.child_proc_started_event.clear()
-        self.remote_peer_worker_exit_event = multiprocessing.Event()
+        # polled on every received packet, hence no (locked) event
+        self.remote_peer_worker_exit_event = SharedFlag()
         self.remote_peer_worker_exit_event.clear()
 
     def __del__(self):
@@ -152,19 +601,20 @@ class ServerHandler:
         server_handler_process = multiprocessing.Process(target=self.wookiee_server_worker,
                                                          args=(self.peer, self.peers, self.server_socket, self.remote_peer_event_list,
                                                                self.source_queue_list, self.remote_peer_worker_exit_event,
-                                                               self.remote_peer_addr_array, self.remote_peer_port_array,
-                                                               self.max_packet_size, self.source_packet_count,
-                                                               self.child_proc_started_event, self.wookiee_constants),
+                                                               self.remote_peer_addr_array,
+                                                               self.packet_stats, self.child_proc_started_event,
+                                                               self.wookiee_constants),
                                                          daemon=True)
         server_handler_process.start()
+        set_process_affinity(server_handler_process, self.cpu_core)
 
         logger.debug(f'WU P{self.peer} >>> Started server process.')
 
         return server_handler_process
 
     def wookiee_server_worker(self, peer, peers, isocket, remote_peer_event_list, source_queue_list,
-                              remote_peer_worker_exit_event, remote_peer_addr_array, remote_peer_port_array,
-                              max_packet_size, source_packet_count, child_proc_started_event, wookiee_constants):
+                              remote_peer_worker_exit_event, remote_peer_addr_array,
+                              packet_stats, child_proc_started_event, wookiee_constants):
         # catch SIGTERM and exit gracefully
         signal.signal(signal.SIGTERM, sigterm_handler)
         # catch SIGINT and exit gracefully
@@ -172,70 +622,117 @@ class ServerHandler:
 
         # set the child process logging level
         logger.setLevel(wookiee_constants.LOGGING_LEVEL)
+        # skip formatting per-packet debug messages unless they will actually get logged
+        debug_logging = logger.isEnabledFor(logging.DEBUG)
 
         # 'server-source-receive'
         wookiee_name = wookiee_constants.WOOKIEE_MODE_NAMES.get(b'100')
 
         logger.info(f'WU P{peer} {wookiee_name} *** Server worker started.')
 
+        # a view of this worker's own (shared memory) stats entry
+        peer_stats = packet_stats[peer]
+        # tracked locally and only published once the worker stops
+        max_packet_size = 0
+        source_packet_count = 0
+        dropped_packet_count = 0
+
+        selector = selectors.DefaultSelector()
+        selector.register(isocket, selectors.EVENT_READ)
+
         try:
             remote_peer_queue_dict = {}
-            queue_vacancy = [True] * peers
+            # one bit per queue, which is set while the queue is vacant
+            vacancy_mask = (1 << peers) - 1
 
             # allow the other server processes to spin up before accepting remote peers
             child_proc_started_event.wait()
 
+            # packets are received in batches and copied straight
+            # into the shared memory slots of their peer's queue
+            packet_batch = PacketBatch(PACKET_BATCH_SIZE, wookiee_constants.RECEIVE_BUFFER_SIZE)
+
+            # bind frequently used lookups to local names, ahead of the packet loop
+            select = selector.select
+            receive_batch = packet_batch.receive
+            batch_addresses = packet_batch.addresses
+            batch_packet = packet_batch.packet
+            packet_sizes = packet_batch.packet_sizes
+            get_queue_index = remote_peer_queue_dict.get
+            receive_buffer_size = wookiee_constants.RECEIVE_BUFFER_SIZE
+
             while not remote_peer_worker_exit_event.is_set():
+                # the peer list will be purged if no remote peer sends anything for a while
+                if len(remote_peer_queue_dict) > 0:
+                    selector_timeout = wookiee_constants.SERVER_PEER_CONNECTION_TIMEOUT
+                else:
+                    selector_timeout = None
+
+                if not select(selector_timeout):
+                    logger.debug(f'WU P{peer} {wookiee_name} *** Timed out while waiting to receive packet...')
+
+                    if len(remote_peer_queue_dict) != 0:
+                        logger.info(f'WU P{peer} {wookiee_name} *** Purging peer list...')
+                        remote_peer_queue_dict.clear()
+                        # clear the shared slots in place, rather than rebinding the name
+                        remote_peer_addr_array[:] = [0] * peers
+                        vacancy_mask = (1 << peers) - 1
+                    continue
+
                 try:
-                    if len(remote_peer_queue_dict) > 0:
-                        isocket.settimeout(wookiee_constants.SERVER_PEER_CONNECTION_TIMEOUT)
-                    idata, iaddr = isocket.recvfrom(wookiee_constants.RECEIVE_BUFFER_SIZE)
-                    #logger.debug(f'WU P{peer} {wookiee_name} *** {iaddr[0]}:{iaddr[1]} sent: {idata}')
-                    if len(remote_peer_queue_dict) > 0:
-                        isocket.settimeout(None)
-
-                    logger.debug(f'WU P{peer} {wookiee_name} *** Received a packet from {iaddr[0]}:{iaddr[1]}...')
-                    packet_size = len(idata)
-                    logger.debug(f'WU P{peer} {wookiee_name} *** Packet size: {packet_size}')
-                    # unlikely, but this is an indicator that the buffer size should be bumped,
-                    # otherwise UDP packets will get truncated and hell will ensue
-                    if packet_size > wookiee_constants.RECEIVE_BUFFER_SIZE:
-                        logger.error(f'WU P{peer} {wookiee_name} *** Packet size of {packet_size} is greater than the receive buffer size!')
-
-                    queue_index = remote_peer_queue_dict.get(iaddr, None)
+                    # drain all pending packets (up to the batch size) in a single system call
+                    packet_count = receive_batch(isocket)
+                    packet_addrs = batch_addresses(packet_count)
+
+                    for slot in range(packet_count):
+                        packet_size = packet_sizes[slot]
+                        iaddr = packet_addrs[slot]
+                        #logger.debug(f'WU P{peer} {wookiee_name} *** {iaddr[0]}:{iaddr[1]} sent: {bytes(batch_packet(slot))}')
+
+                        if debug_logging:
+                            logger.debug(f'WU P{peer} {wookiee_name} *** Received a packet from {iaddr[0]}:{iaddr[1]}...')
+                            logger.debug(f'WU P{peer} {wookiee_name} *** Packet size: {packet_size}')
+                        # unlikely, but this is an indicator that the buffer size should be bumped,
+                        # otherwise UDP packets will get truncated and hell will ensue
+                        if packet_size > receive_buffer_size:
+                            logger.error(f'WU P{peer} {wookiee_name} *** Packet size of {packet_size} is greater than the receive buffer size!')
+                            # only the truncated packet content is available for queuing
+                            packet_sizes[slot] = receive_buffer_size
+
+                        queue_index = get_queue_index(iaddr, None)
 
-                    try:
                         if queue_index is None:
                             logger.info(f'WU P{peer} {wookiee_name} *** Detected new remote peer: {iaddr[0]}:{iaddr[1]}')
 
                             # try to free up any dropped peers if there are no vacancies
-                            if True not in queue_vacancy:
+                            if vacancy_mask == 0:
                                 for vacate_queue_index in range(peers):
                                     if not remote_peer_event_list[vacate_queue_index].is_set():
                                         logger.debug(f'WU P{peer} {wookiee_name} *** Vacating queue {vacate_queue_index}...')
-                                        # '!' (byte order) =  network/big-endian, 'L' (type) = unsigned long
-                                        vaddr = (socket.inet_ntoa(struct.pack('!L', remote_peer_addr_array[vacate_queue_index])),
-                                                 remote_peer_port_array[vacate_queue_index])
-                                        if vaddr != (0, 0):
+                                        vaddr_value = remote_peer_addr_array[vacate_queue_index]
+                                        if vaddr_value != 0:
                                             try:
-                                                del remote_peer_queue_dict[vaddr]
+                                                del remote_peer_queue_dict[unpack_peer_address(vaddr_value)]
                                                 remote_peer_addr_array[vacate_queue_index] = 0
-                                                remote_peer_port_array[vacate_queue_index] = 0
-                                                queue_vacancy[vacate_queue_index] = True
+                                                vacancy_mask |= 1 << vacate_queue_index
                                                 logger.debug(f'WU P{peer} {wookiee_name} *** Queue marked as vacant.')
                                             except KeyError:
                                                 logger.error(f'WU P{peer} {wookiee_name} *** Failed to vacate queue {vacate_queue_index}!')
 
-                            # determine the lowest available queue index
-                            queue_index = queue_vacancy.index(True)
+                            # will happen if more peers than are supported attempt to connect
+                            if vacancy_mask == 0:
+                                # simply ignore the packets received from extra peers in this case
+                                logger.warning(f'WU P{peer} {wookiee_name} *** {iaddr[0]}:{iaddr[1]} tried to connect but found no vacancies.')
+                                continue
+
+                            # determine the lowest available queue index (the lowest set bit)
+                            queue_index = (vacancy_mask & -vacancy_mask).bit_length() - 1
                             logger.debug(f'WU P{peer} {wookiee_name} *** queue_index: {queue_index}')
                             # set the inbound address in the dictionary lookups
                             remote_peer_queue_dict.update({iaddr: queue_index})
-                            # struct.unpack -> "The result is a tuple even if it contains exactly one item."
-                            # '!' (byte order) =  network/big-endian, 'L' (type) = unsigned long
-                            remote_peer_addr_array[queue_index] = struct.unpack('!L', socket.inet_aton(iaddr[0]))[0]
-                            remote_peer_port_array[queue_index] = iaddr[1]
-                            queue_vacancy[queue_index] = False
+                            # publish the address and port with a single store
+                            remote_peer_addr_array[queue_index] = pack_peer_address(iaddr)
+                            vacancy_mask &= ~(1 << queue_index)
                             remote_peer_event_list[queue_index].set()
 
                         else:
@@ -243,32 +740,26 @@ class ServerHandler:
                                 logger.info(f'WU P{peer} {wookiee_name} *** Reinstated dropped peer: {iaddr[0]}:{iaddr[1]}')
                                 remote_peer_event_list[queue_index].set()
 
-                        logger.debug(f'WU P{peer} {wookiee_name} *** remote_peer_queue_dict: {remote_peer_queue_dict}')
-                        if source_queue_list[queue_index].full():
-                            logger.error(f'WU P{peer} {wookiee_name} *** Packet queue has hit its capacity limit!')
-                        source_queue_list[queue_index].put(idata)
-
-                        source_packet_count.value += 1
-                        if packet_size > max_packet_size.value:
-                            max_packet_size.value = packet_size
-                            logger.debug(f'WU P{peer} {wookiee_name} *** Max packet size now set to: {max_packet_size.value}')
-
-                        logger.debug(f'WU P{peer} {wookiee_name} *** Packet queued for replication on queue {queue_index}...')
-
-                    # will happen if more peers than are supported attempt to connect
-                    except ValueError:
-                        # simply ignore the packets received from extra peers in this case
-                        logger.warning(f'WU P{peer} {wookiee_name} *** {iaddr[0]}:{iaddr[1]} tried to connect but found no vacancies.')
-
-                except socket.timeout:
-                    logger.debug(f'WU P{peer} {wookiee_name} *** Timed out while waiting to receive packet...')
-
-                    if len(remote_peer_queue_dict) != 0:
-                        logger.info(f'WU P{peer} {wookiee_name} *** Purging peer list...')
-                        remote_peer_queue_dict.clear()
-                        remote_peer_addr_array = [0] * peers
-                        remote_peer_port_array = [0] * peers
-                        queue_vacancy = [True] * peers
+                        if debug_logging:
+                            logger.debug(f'WU P{peer} {wookiee_name} *** remote_peer_queue_dict: {remote_peer_queue_dict}')
+                        # drop packets rather than stall the receive loop (and with it all other
+                        # remote peers) if a relay worker can't keep up, as would any UDP stack
+                        try:
+                            source_queue_list[queue_index].put_nowait(batch_packet(slot))
+                        except queue.Full:
+                            dropped_packet_count += 1
+                            # don't flood the logs during sustained periods of congestion
+                            if dropped_packet_count % PACKET_DROP_LOG_INTERVAL == 1:
+                                logger.error((f'WU P{peer} {wookiee_name} *** Packet queue {queue_index} has hit its capacity limit! '
+                                              f'Dropped {dropped_packet_count} packet(s) so far.'))
+
+                        source_packet_count += 1
+                        if packet_size > max_packet_size:
+                            max_packet_size = packet_size
+                            logger.debug(f'WU P{peer} {wookiee_name} *** Max packet size now set to: {packet_size}')
+
+                        if debug_logging:
+                            logger.debug(f'WU P{peer} {wookiee_name} *** Packet queued for replication on queue {queue_index}...')
 
                 # this is only raised on Windows, apparently
                 except ConnectionResetError:
@@ -277,6 +768,15 @@ class ServerHandler:
         except SystemExit:
             pass
 
+        try:
+            selector.close()
+        except:
+            pass
+
+        peer_stats.max_packet_size = max_packet_size
+        peer_stats.source_packet_count = source_packet_count
+        peer_stats.dropped_packet_count = dropped_packet_count
+
         logger.info(f'WU P{peer} {wookiee_name} *** Server worker stopped.')
 
 class RemotePeerHandler:
@@ -291,9 +791,8 @@ class RemotePeerHandler:
 
     def __init__(self, peer, wookiee_mode, intf, local_ip, source_ip, destination_ip,
                  source_port, destination_port, relay_port, source_queue,
-                 destination_queue, remote_peer_event, remote_peer_handlers_reset_queue,
-                 remote_peer_addr_array, remote_peer_port_array, server_socket,
-                 max_packet_size, source_packet_count, destination_packet_count, wookiee_constants):
+                 remote_peer_event, remote_peer_handlers_reset_queue, remote_peer_addr_array,
+                 server_socket, packet_stats, cpu_cores, wookiee_constants):
         self.peer = peer
         self.wookiee_mode = wookiee_mode
 
@@ -306,18 +805,16 @@ class RemotePeerHandler:
         self.relay_port = relay_port
 
         self.source_queue = source_queue
-        self.destination_queue = destination_queue
         self.remote_peer_event = remote_peer_event
         self.remote_peer_event.clear()
         self.remote_peer_handlers_reset_queue = remote_peer_handlers_reset_queue
 
         self.remote_peer_addr_array = remote_peer_addr_array
-        self.remote_peer_port_array = remote_peer_port_array
         self.server_socket = server_socket
 
-        self.max_packet_size = max_packet_size
-        self.source_packet_count = source_packet_count
-        self.destination_packet_count = destination_packet_count
+        self.packet_stats = packet_stats
+        # CPU cores for the source and destination worker processes
+        self.cpu_cores = cpu_cores
 
         self.wookiee_constants = wookiee_constants
 
@@ -358,6 +855,8 @@ class RemotePeerHandler:
                     logger.critical(f'WU P{self.peer} >>> Interface unavailable or port {self.source_port} is in use.')
                 raise SystemExit(18)
 
+            set_socket_options(self.source, self.peer, self.wookiee_constants)
+
         self.destination = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
         try:
             self.destination.setsockopt(socket.SOL_SOCKET, socket.SO_BINDTODEVICE, self.intf)
@@ -379,9 +878,12 @@ class RemotePeerHandler:
             raise SystemExit(20)
         #######################################################################
 
+        set_socket_options(self.destination, self.peer, self.wookiee_constants)
+
         self.link_event = multiprocessing.Event()
         self.link_event.clear()
-        self.exit_event = multiprocessing.Event()
+        # polled on every packet batch, hence no (locked) event
+        self.exit_event = SharedFlag()
         self.exit_event.clear()
 
     def __del__(self):
@@ -411,67 +913,52 @@ class RemotePeerHandler:
 
         peer_handler_process_list = []
 
-        # only clients must spawn a peer count of client-source-receive processes,
-        # since servers will only need one catch-all receive process
+        # clients forward packets received from the server straight onto the end relay point,
+        # while servers need to relay packets queued by the catch-all server handler process
         if self.wookiee_mode == self.wookiee_constants.WOOKIEE_MODE_CLIENT:
-            peer_handler_process = multiprocessing.Process(target=self.wookiee_receive_worker,
-                                                           # + '-source-receive'
-                                                           args=(self.peer, self.wookiee_mode + b'00', self.source,
-                                                                 (self.source_ip, self.source_port), self.socket_timeout,
+            peer_handler_process = multiprocessing.Process(target=self.wookiee_forward_worker,
+                                                           # + '-source-forward'
+                                                           args=(self.peer, self.wookiee_mode + b'02', self.source,
+                                                                 (self.source_ip, self.source_port), self.destination,
+                                                                 (self.destination_ip, self.destination_port), self.socket_timeout,
                                                                  self.link_event, self.remote_peer_event,
                                                                  self.exit_event, self.remote_peer_handlers_reset_queue,
-                                                                 self.source_queue, self.destination_queue,
-                                                                 self.max_packet_size, self.source_packet_count,
+                                                                 None, self.packet_stats, self.wookiee_constants),
+                                                           daemon=True)
+        else:
+            peer_handler_process = multiprocessing.Process(target=self.wookiee_relay_worker,
+                                                           # + '-source-relay'
+                                                           args=(self.peer, self.wookiee_mode + b'01', self.destination,
+                                                                 (self.destination_ip, self.destination_port), self.link_event,
+                                                                 self.remote_peer_event, self.exit_event, self.source_queue,
                                                                  self.wookiee_constants),
                                                            daemon=True)
-            peer_handler_process.start()
-            peer_handler_process_list.append(peer_handler_process)
-
-        peer_handler_process = multiprocessing.Process(target=self.wookiee_relay_worker,
-                                                       # + '-source-relay'
-                                                       args=(self.peer, self.wookiee_mode + b'01', self.destination,
-                                                             (self.destination_ip, self.destination_port), self.link_event,
-                                                             self.remote_peer_event, self.exit_event, self.source_queue,
-                                                             self.destination_queue, None,
-                                                             None, self.destination_packet_count,
-                                                             self.wookiee_constants),
-                                                       daemon=True)
         peer_handler_process.start()
+        set_process_affinity(peer_handler_process, self.cpu_cores[0])
         peer_handler_process_list.append(peer_handler_process)
 
-        peer_handler_process = multiprocessing.Process(target=self.wookiee_receive_worker,
-                                                       # + '-destination-receive'
-                                                       args=(self.peer, self.wookiee_mode + b'10', self.destination,
-                                                             (None, None), self.socket_timeout,
+        peer_handler_process = multiprocessing.Process(target=self.wookiee_forward_worker,
+                                                       # + '-destination-forward'
+                                                       args=(self.peer, self.wookiee_mode + b'12', self.destination,
+                                                             (None, None), self.source,
+                                                             (self.source_ip, self.source_port), self.socket_timeout,
                                                              self.link_event, self.remote_peer_event,
                                                              self.exit_event, self.remote_peer_handlers_reset_queue,
-                                                             self.source_queue, self.destination_queue,
-                                                             self.max_packet_size, self.source_packet_count,
-                                                             self.wookiee_constants),
-                                                       daemon=True)
-        peer_handler_process.start()
-        peer_handler_process_list.append(peer_handler_process)
-
-        peer_handler_process = multiprocessing.Process(target=self.wookiee_relay_worker,
-                                                       # + '-destination-relay'
-                                                       args=(self.peer, self.wookiee_mode + b'11', self.source,
-                                                             (self.source_ip, self.source_port), self.link_event,
-                                                             self.remote_peer_event, self.exit_event, self.source_queue,
-                                                             self.destination_queue, self.remote_peer_addr_array,
-                                                             self.remote_peer_port_array, self.destination_packet_count,
-                                                             self.wookiee_constants),
+                                                             self.remote_peer_addr_array,
+                                                             self.packet_stats, self.wookiee_constants),
                                                        daemon=True)
         peer_handler_process.start()
+        set_process_affinity(peer_handler_process, self.cpu_cores[1])
         peer_handler_process_list.append(peer_handler_process)
 
         logger.debug(f'WU P{self.peer} >>> Started remote peer handler processes.')
 
         return peer_handler_process_list
 
-    def wookiee_receive_worker(self, peer, wookiee_mode, isocket, iaddr,
+    def wookiee_forward_worker(self, peer, wookiee_mode, isocket, iaddr, osocket, oaddr,
                                socket_timeout, link_event, remote_peer_event, exit_event,
-                               remote_peer_handlers_reset_queue, source_queue, destination_queue,
-                               max_packet_size, source_packet_count, wookiee_constants):
+                               remote_peer_handlers_reset_queue, remote_peer_addr_array,
+                               packet_stats, wookiee_constants):
         # catch SIGTERM and exit gracefully
         signal.signal(signal.SIGTERM, sigterm_handler)
         # catch SIGINT and exit gracefully
@@ -479,28 +966,44 @@ class RemotePeerHandler:
 
         # set the child process logging level
         logger.setLevel(wookiee_constants.LOGGING_LEVEL)
+        # skip formatting per-packet debug messages unless they will actually get logged
+        debug_logging = logger.isEnabledFor(logging.DEBUG)
 
         wookiee_name = wookiee_constants.WOOKIEE_MODE_NAMES.get(wookiee_mode)
 
-        logger.info(f'WU P{peer} {wookiee_name} +++ Receive worker started.')
+        logger.info(f'WU P{peer} {wookiee_name} +++ Forward worker started.')
+
+        # a view of this peer's (shared memory) stats entry
+        peer_stats = packet_stats[peer]
+        # tracked locally and only published once the worker stops
+        max_packet_size = 0
+        # either the source or destination packet count, depending on the direction
+        packet_count_total = 0
+
+        # packets are relayed from within the same process as soon as they are
+        # received, so there's no need for any inter-process queue handoffs
+        selector = selectors.DefaultSelector()
+        selector.register(isocket, selectors.EVENT_READ)
 
         try:
             # ensure no timeout is actively enforced on the socket
             isocket.settimeout(None)
 
-            # 'client-source-receive'
-            if wookiee_mode == b'000':
+            # 'client-source-forward'
+            if wookiee_mode == b'002':
                 ####################### UDP KEEP ALIVE LOGIC - CLIENT #########################
                 if not remote_peer_event.is_set():
                     peer_connection_received = False
+                    keep_alive_due = True
                     logger.info(f'WU P{peer} {wookiee_name} +++ Initiating relay connection keep alive...')
 
                     while not remote_peer_event.is_set() and not exit_event.is_set():
-                        logger.debug(f'WU P{peer} {wookiee_name} +++ Sending a keep alive packet...')
-                        isocket.sendto(RemotePeerHandler.KEEP_ALIVE_PACKET, iaddr)
+                        if keep_alive_due:
+                            logger.debug(f'WU P{peer} {wookiee_name} +++ Sending a keep alive packet...')
+                            isocket.sendto(RemotePeerHandler.KEEP_ALIVE_PACKET, iaddr)
 
-                        logger.debug(f'WU P{peer} {wookiee_name} +++ Listening for a keep alive packet...')
-                        isocket.settimeout(wookiee_constants.KEEP_ALIVE_PING_TIMEOUT)
+                            logger.debug(f'WU P{peer} {wookiee_name} +++ Listening for a keep alive packet...')
+                            isocket.settimeout(wookiee_constants.KEEP_ALIVE_PING_TIMEOUT)
 
                         try:
                             kadata, kaaddr = isocket.recvfrom(wookiee_constants.RECEIVE_BUFFER_SIZE)
@@ -514,7 +1017,11 @@ class RemotePeerHandler:
                                         logger.info(f'WU P{peer} {wookiee_name} +++ Server connection confirmed!')
                                         peer_connection_received = True
 
-                                    sleep(wookiee_constants.KEEP_ALIVE_PING_INTERVAL)
+                                    # rather than sleeping until the next keep alive packet is due, keep
+                                    # listening, since the server will send a halt packet as soon as
+                                    # a remote peer connects, and relaying can then start right away
+                                    isocket.settimeout(wookiee_constants.KEEP_ALIVE_PING_INTERVAL)
+                                    keep_alive_due = False
 
                                 elif kadata == RemotePeerHandler.KEEP_ALIVE_HALT_PACKET:
                                     logger.info(f'WU P{peer} {wookiee_name} +++ Connection keep alive halted.')
@@ -527,77 +1034,117 @@ class RemotePeerHandler:
                                 logger.warning(f'WU P{peer} {wookiee_name} +++ Received a packet from an unexpected source.')
 
                         except socket.timeout:
-                            logger.debug(f'WU P{peer} {wookiee_name} +++ Timed out waiting for a reply.')
+                            if keep_alive_due:
+                                logger.debug(f'WU P{peer} {wookiee_name} +++ Timed out waiting for a reply.')
+                            keep_alive_due = True
 
-                        finally:
-                            isocket.settimeout(None)
+                    isocket.settimeout(None)
 
                 logger.debug(f'WU P{peer} {wookiee_name} +++ Clearing link event...')
                 link_event.set()
                 logger.debug(f'WU P{peer} {wookiee_name} +++ Link event cleared.')
                 ####################### UDP KEEP ALIVE LOGIC - CLIENT #########################
 
-            # '*-destination-receive'
-            if wookiee_mode[1:] == b'10':
+            # '*-destination-forward'
+            if wookiee_mode[1:] == b'12':
                 logger.debug(f'WU P{peer} {wookiee_name} +++ Waiting for the peer connection to be established...')
                 link_event.wait()
                 logger.debug(f'WU P{peer} {wookiee_name} +++ Cleared by link event.')
 
+            # 'server-destination-forward'
+            if wookiee_mode == b'112':
+                # cache the remote peer address value and keep using it until the worker resets
+                oaddr_value = 0
+                while oaddr_value == 0 and not exit_event.is_set():
+                    oaddr_value = remote_peer_addr_array[peer - 1]
+                    if oaddr_value != 0:
+                        oaddr = unpack_peer_address(oaddr_value)
+                        logger.info(f'WU P{peer} {wookiee_name} +++ Cached remote peer IP address/port.')
+                    else:
+                        logger.debug(f'WU P{peer} {wookiee_name} +++ Waiting to establish remote peer IP address/port.')
+                        # wait times here should be minimal due to link_event sync
+                        sleep(0.05)
+
+            # resolve mode specific behavior once, ahead of the packet loop
+            # '*-source-forward'
+            source_forward = wookiee_mode[1:] == b'02'
+            # 'client-source-forward'
+            track_max_packet_size = wookiee_mode == b'002'
+
+            # '*-source-forward' workers only need to periodically check the exit event,
+            # while '*-destination-forward' workers will reset the channel if timed out
+            if source_forward:
+                selector_timeout = RemotePeerHandler.DEFAULT_TIMEOUT
+            else:
+                selector_timeout = socket_timeout
+
+            packet_batch = PacketBatch(PACKET_BATCH_SIZE, wookiee_constants.RECEIVE_BUFFER_SIZE)
+
+            # bind frequently used lookups to local names, ahead of the packet loop
+            select = selector.select
+            receive_batch = packet_batch.receive
+            send_batch = packet_batch.send
+            batch_packet = packet_batch.packet
+            packet_sizes = packet_batch.packet_sizes
+            receive_buffer_size = wookiee_constants.RECEIVE_BUFFER_SIZE
+            keep_alive_packet = RemotePeerHandler.KEEP_ALIVE_PACKET
+
             while not exit_event.is_set():
+                if not select(selector_timeout):
+                    # '*-destination-forward'
+                    if not source_forward and not exit_event.is_set():
+                        logger.warning(f'WU P{peer} {wookiee_name} +++ The UDP connection has timed out. Resetting sockets...')
+                        remote_peer_handlers_reset_queue.put(peer)
+                        exit_event.set()
+                    else:
+                        logger.debug(f'WU P{peer} {wookiee_name} +++ Timed out while waiting to receive packet...')
+                    continue
+
                 try:
-                    if remote_peer_event.is_set():
-                        # '*-source-receive'
-                        if wookiee_mode[1:] == b'00':
-                            isocket.settimeout(RemotePeerHandler.DEFAULT_TIMEOUT)
-                        else:
-                            isocket.settimeout(socket_timeout)
-                    idata, iaddr = isocket.recvfrom(wookiee_constants.RECEIVE_BUFFER_SIZE)
-                    #logger.debug(f'WU P{peer} {wookiee_name} +++ {iaddr[0]}:{iaddr[1]} sent: {idata}')
-                    if remote_peer_event.is_set():
-                        isocket.settimeout(None)
-
-                    if idata != RemotePeerHandler.KEEP_ALIVE_PACKET:
-                        logger.debug(f'WU P{peer} {wookiee_name} +++ Received a packet from {iaddr[0]}:{iaddr[1]}...')
-                        packet_size = len(idata)
-                        logger.debug(f'WU P{peer} {wookiee_name} +++ Packet size: {packet_size}')
+                    # drain all pending packets (up to the batch size) in a single system call
+                    packet_count = receive_batch(isocket)
+                    if debug_logging:
+                        logger.debug(f'WU P{peer} {wookiee_name} +++ Received {packet_count} packet(s)...')
+                    forward_count = packet_count
+
+                    for slot in range(packet_count):
+                        packet_size = packet_sizes[slot]
+                        if debug_logging:
+                            logger.debug(f'WU P{peer} {wookiee_name} +++ Packet size: {packet_size}')
                         # unlikely, but this is an indicator that the buffer size should be bumped,
                         # otherwise UDP packets will get truncated (which can be bad up to very bad)
-                        if packet_size > wookiee_constants.RECEIVE_BUFFER_SIZE:
+                        if packet_size > receive_buffer_size:
                             logger.error(f'WU P{peer} {wookiee_name} +++ Packet size of {packet_size} is greater than the receive buffer size!')
+                            # only the truncated packet content is available for forwarding
+                            packet_sizes[slot] = receive_buffer_size
+
+                        # can actually happen in case game servers keep pinging dropped clients
+                        if batch_packet(slot) == keep_alive_packet:
+                            # packets received ahead of the keep alive packet will still get forwarded
+                            forward_count = slot
+                            break
+
+                        # 'client-source-forward'
+                        if track_max_packet_size and packet_size > max_packet_size:
+                            max_packet_size = packet_size
+                            logger.debug(f'WU P{peer} {wookiee_name} +++ New max_packet_size is: {packet_size}')
+
+                    if forward_count > 0:
+                        sent_count = send_batch(osocket, forward_count, oaddr)
 
-                        # '*-source-receive'
-                        if wookiee_mode[1:] == b'00':
-                            if source_queue.full():
-                                logger.error(f'WU P{peer} {wookiee_name} +++ Packet queue has hit its capacity limit!')
-                            source_queue.put(idata)
-
-                            source_packet_count.value += 1
-                            # 'client-source-receive'
-                            if wookiee_mode == b'000' and packet_size > max_packet_size.value:
-                                max_packet_size.value = packet_size
-                                logger.debug(f'WU P{peer} {wookiee_name} +++ New max_packet_size is: {max_packet_size.value}')
+                        if source_forward:
+                            packet_count_total += forward_count
                         else:
-                            if destination_queue.full():
-                                logger.error(f'WU P{peer} {wookiee_name} +++ Packet queue has hit its capacity limit!')
-                            destination_queue.put(idata)
+                            packet_count_total += sent_count
 
-                        logger.debug(f'WU P{peer} {wookiee_name} +++ Packet queued for replication...')
+                        if debug_logging:
+                            logger.debug(f'WU P{peer} {wookiee_name} +++ Replicated {sent_count} packet(s) to {oaddr[0]}:{oaddr[1]}...')
 
-                    # can actually happen in case game servers keep pinging dropped clients
-                    else:
+                    if forward_count < packet_count:
                         logger.warning(f'WU P{peer} {wookiee_name} +++ Keep alive packet detected. Resetting sockets...')
                         remote_peer_handlers_reset_queue.put(peer)
                         exit_event.set()
 
-                except socket.timeout:
-                    # '*-destination-receive'
-                    if wookiee_mode[1:] == b'10' and not exit_event.is_set():
-                        logger.warning(f'WU P{peer} {wookiee_name} +++ The UDP connection has timed out. Resetting sockets...')
-                        remote_peer_handlers_reset_queue.put(peer)
-                        exit_event.set()
-                    else:
-                        logger.debug(f'WU P{peer} {wookiee_name} +++ Timed out while waiting to receive packet...')
-
                 # this is only raised on Windows, apparently
                 except ConnectionResetError:
                     logger.warning(f'WU P{peer} {wookiee_name} +++ Packet transmission was forcibly halted.')
@@ -606,19 +1153,28 @@ class RemotePeerHandler:
             pass
 
         try:
-            logger.debug(f'WU P{peer} {wookiee_name} +++ Closing process socket instance...')
+            logger.debug(f'WU P{peer} {wookiee_name} +++ Closing process socket instances...')
+            selector.close()
             isocket.close()
-            logger.debug(f'WU P{peer} {wookiee_name} +++ Process socket instance closed.')
+            osocket.close()
+            logger.debug(f'WU P{peer} {wookiee_name} +++ Process socket instances closed.')
         except:
             pass
 
-        logger.info(f'WU P{peer} {wookiee_name} +++ Receive worker stopped.')
+        # workers are restarted on channel resets, so add to (or keep the largest of) the recorded
+        # values, while only ever touching the fields owned by this worker's direction
+        if max_packet_size > peer_stats.max_packet_size:
+            peer_stats.max_packet_size = max_packet_size
+        if wookiee_mode[1:] == b'02':
+            peer_stats.source_packet_count += packet_count_total
+        else:
+            peer_stats.destination_packet_count += packet_count_total
+
+        logger.info(f'WU P{peer} {wookiee_name} +++ Forward worker stopped.')
 
     def wookiee_relay_worker(self, peer, wookiee_mode, osocket, oaddr,
-                             link_event, remote_peer_event, exit_event, source_queue,
-                             destination_queue, remote_peer_addr_array,
-                             remote_peer_port_array, destination_packet_count,
-                             wookiee_constants):
+                             link_event, remote_peer_event, exit_event,
+                             source_queue, wookiee_constants):
         # catch SIGTERM and exit gracefully
         signal.signal(signal.SIGTERM, sigterm_handler)
         # catch SIGINT and exit gracefully
@@ -626,15 +1182,13 @@ class RemotePeerHandler:
 
         # set the child process logging level
         logger.setLevel(wookiee_constants.LOGGING_LEVEL)
+        # skip formatting per-packet debug messages unless they will actually get logged
+        debug_logging = logger.isEnabledFor(logging.DEBUG)
 
         wookiee_name = wookiee_constants.WOOKIEE_MODE_NAMES.get(wookiee_mode)
 
         logger.info(f'WU P{peer} {wookiee_name} --- Relay worker started.')
 
-        # 'server-destination-relay'
-        if wookiee_mode == b'111':
-            remote_peer_addr_cached = False
-
         try:
             # ensure no timeout is actively enforced on the socket
             osocket.settimeout(None)
@@ -644,11 +1198,27 @@ class RemotePeerHandler:
                 ####################### UDP KEEP ALIVE LOGIC - SERVER #########################
                 if not remote_peer_event.is_set():
                     peer_connection_received = False
+                    kaaddr = None
                     logger.info(f'WU P{peer} {wookiee_name} --- Initiating relay connection keep alive...')
 
-                    while not remote_peer_event.is_set() and not exit_event.is_set():
-                        logger.debug(f'WU P{peer} {wookiee_name} --- Listening for a keep alive packet...')
-                        kadata, kaaddr = osocket.recvfrom(wookiee_constants.RECEIVE_BUFFER_SIZE)
+                    # replies are sent right away, with the client pacing keep alive packet exchanges,
+                    # and the listen timeout is only used to notice a connected remote peer in time
+                    osocket.settimeout(KEEP_ALIVE_HALT_POLL_INTERVAL)
+                    logger.debug(f'WU P{peer} {wookiee_name} --- Listening for keep alive packets...')
+
+                    while not exit_event.is_set():
+                        if remote_peer_event.is_set():
+                            # the client address is only known after its first keep alive packet
+                            if kaaddr is not None:
+                                logger.debug(f'WU P{peer} {wookiee_name} --- Halting keep alive...')
+                                osocket.sendto(RemotePeerHandler.KEEP_ALIVE_HALT_PACKET, kaaddr)
+                                logger.info(f'WU P{peer} {wookiee_name} --- Connection keep alive halted.')
+                                break
+
+                        try:
+                            kadata, kaaddr = osocket.recvfrom(wookiee_constants.RECEIVE_BUFFER_SIZE)
+                        except socket.timeout:
+                            continue
                         #logger.debug(f'WU P{peer} {wookiee_name} --- {kaaddr[0]}:{kaaddr[1]} sent: {kadata}')
 
                         if kadata == RemotePeerHandler.KEEP_ALIVE_PACKET:
@@ -657,8 +1227,6 @@ class RemotePeerHandler:
                             if not peer_connection_received:
                                 logger.info(f'WU P{peer} {wookiee_name} --- Client connection confirmed!')
                                 peer_connection_received = True
-
-                            sleep(wookiee_constants.KEEP_ALIVE_PING_INTERVAL)
                         # the client should reset sockets on the next keep alive packet trasmission
                         else:
                             logger.warning(f'WU P{peer} {wookiee_name} --- Invalid keep alive packet content.')
@@ -666,10 +1234,8 @@ class RemotePeerHandler:
                         if not remote_peer_event.is_set():
                             logger.debug(f'WU P{peer} {wookiee_name} --- Sending a keep alive packet...')
                             osocket.sendto(RemotePeerHandler.KEEP_ALIVE_PACKET, kaaddr)
-                        else:
-                            logger.debug(f'WU P{peer} {wookiee_name} --- Halting keep alive...')
-                            osocket.sendto(RemotePeerHandler.KEEP_ALIVE_HALT_PACKET, kaaddr)
-                            logger.info(f'WU P{peer} {wookiee_name} --- Connection keep alive halted.')
+
+                    osocket.settimeout(None)
 
                 # the server can't otherwise know the public (exit) IP address of the client
                 oaddr = kaaddr
@@ -679,46 +1245,39 @@ class RemotePeerHandler:
                 logger.debug(f'WU P{peer} {wookiee_name} --- Link event cleared.')
                 ####################### UDP KEEP ALIVE LOGIC - SERVER #########################
 
-            while not exit_event.is_set():
-                # 'server-destination-relay'
-                if wookiee_mode == b'111':
-                    link_event.wait()
-                    # cache the remote peer address value and keep using it until the worker resets
-                    if not remote_peer_addr_cached:
-                        oaddr = (0, 0)
-                        while oaddr == (0, 0):
-                            # '!' (byte order) =  network/big-endian, 'L' (type) = unsigned long
-                            oaddr = (socket.inet_ntoa(struct.pack('!L', remote_peer_addr_array[peer - 1])),
-                                     remote_peer_port_array[peer - 1])
-                            if oaddr != (0, 0):
-                                logger.info(f'WU P{peer} {wookiee_name} --- Cached remote peer IP address/port.')
-                                remote_peer_addr_cached = True
-                            else:
-                                logger.debug(f'WU P{peer} {wookiee_name} --- Waiting to establish remote peer IP address/port.')
-                                # wait times here should be minimal due to link_event sync
-                                sleep(0.05)
+            packet_batch = PacketBatch(PACKET_BATCH_SIZE, wookiee_constants.RECEIVE_BUFFER_SIZE)
+
+            # bind frequently used lookups to local names, ahead of the packet loop
+            get_into = source_queue.get_into
+            send_batch = packet_batch.send
+            batch_slot = packet_batch.slot
+            packet_sizes = packet_batch.packet_sizes
+            batch_size = packet_batch.batch_size
 
+            while not exit_event.is_set():
                 try:
-                    # '*-source-relay'
-                    if wookiee_mode[1:] == b'01':
-                        odata = source_queue.get(True, RemotePeerHandler.DEFAULT_TIMEOUT)
-                    else:
-                        odata = destination_queue.get(True, RemotePeerHandler.DEFAULT_TIMEOUT)
+                    packet_sizes[0] = get_into(batch_slot(0), True, RemotePeerHandler.DEFAULT_TIMEOUT)
+                    packet_count = 1
 
+                    # pick up any other queued packets, so that they can be relayed in one go
                     try:
-                        logger.debug(f'WU P{peer} {wookiee_name} --- Using remote peer: {oaddr}')
-                        osocket.sendto(odata, oaddr)
-
-                        # '*-destination-relay'
-                        if wookiee_mode[1:] == b'11':
-                            destination_packet_count.value += 1
+                        while packet_count < batch_size:
+                            packet_sizes[packet_count] = get_into(batch_slot(packet_count), False)
+                            packet_count += 1
+                    except queue.Empty:
+                        pass
 
-                        logger.debug(f'WU P{peer} {wookiee_name} --- Replicated a packet to {oaddr[0]}:{oaddr[1]}...')
+                    try:
+                        if debug_logging:
+                            logger.debug(f'WU P{peer} {wookiee_name} --- Using remote peer: {oaddr}')
+                        sent_count = send_batch(osocket, packet_count, oaddr)
+                        if debug_logging:
+                            logger.debug(f'WU P{peer} {wookiee_name} --- Replicated {sent_count} packet(s) to {oaddr[0]}:{oaddr[1]}...')
 
                     # sometimes when a peer is dropped relay packets may still get sent its way;
                     # simply ignore/drop them on relay if that's the case
                     except TypeError:
-                        logger.debug(f'WU P{peer} {wookiee_name} --- Unknown or dropped remote peer. Ignoring packet.')
+                        logger.debug(f'WU P{peer} {wookiee_name} --- Unknown or dropped remote peer. Ignoring packet(s).')
 
                 except queue.Empty:
                     logger.debug(f'WU P{peer} {wookiee_name} --- Timed out while waiting to send packet...')
@@ -808,6 +1367,16 @@ if __name__ == "__main__":
         logger.debug(f'WU >>> SERVER_PEER_CONNECTION_TIMEOUT: {SERVER_PEER_CONNECTION_TIMEOUT}')
     except:
         SERVER_PEER_CONNECTION_TIMEOUT = 60 # seconds
+    try:
+        SOCKET_BUFFER_SIZE = connection_section.getint('socket_buffer_size')
+        logger.debug(f'WU >>> SOCKET_BUFFER_SIZE: {SOCKET_BUFFER_SIZE}')
+    except:
+        SOCKET_BUFFER_SIZE = 0 # bytes (system default)
+    try:
+        SOCKET_BUSY_POLL = connection_section.getint('socket_busy_poll')
+        logger.debug(f'WU >>> SOCKET_BUSY_POLL: {SOCKET_BUSY_POLL}')
+    except:
+        SOCKET_BUSY_POLL = 0 # microseconds
 
     # parsing keep alive parameters
     try:
@@ -824,7 +1393,8 @@ if __name__ == "__main__":
     # constants determined at runtime need to be shared with child processes (they are read in __main__)
     wookiee_constants = WookieeConstants(LOGGING_LEVEL, RECEIVE_BUFFER_SIZE, CLIENT_CONNECTION_TIMEOUT,
                                          SERVER_CONNECTION_TIMEOUT, SERVER_PEER_CONNECTION_TIMEOUT,
-                                         KEEP_ALIVE_PING_INTERVAL, KEEP_ALIVE_PING_TIMEOUT)
+                                         KEEP_ALIVE_PING_INTERVAL, KEEP_ALIVE_PING_TIMEOUT,
+                                         SOCKET_BUFFER_SIZE, SOCKET_BUSY_POLL)
 
     parser = argparse.ArgumentParser(description=('-=|- The Wookiee Unicaster -|=- Relays UDP packets between a private host '
                                                   'and multiple remote peers by leveraging a public IP(v4) address. '
@@ -853,6 +1423,8 @@ if __name__ == "__main__":
     optional.add_argument('--client-relay-base-port', help=('Base port in the range used as source for endpoint relaying on the client. '
                                                           f'Defaults to {CLIENT_RELAY_BASE_PORT_DEFAULT} if unspecified.'),
                           default=str(CLIENT_RELAY_BASE_PORT_DEFAULT))
+    optional.add_argument('--cpu-affinity', help=('Comma separated list of CPU cores, which worker processes will be pinned to '
+                                                  'in a round-robin fashion. Only supported on Linux.'))
     optional.add_argument('-q', '--quiet', help='Disable all logging output.', action='store_true')
 
     args = parser.parse_args()
@@ -890,19 +1462,12 @@ if __name__ == "__main__":
         logger.debug(f'WU >>> intf: {args.interface}')
         # determine the local_ip based on the network interface name
         try:
-            local_ip_query_subprocess = subprocess.run(['ip', '-4', 'addr', 'show', args.interface],
-                                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
-                                                       check=True)
-            local_ip_query_output = local_ip_query_subprocess.stdout.decode('utf-8')
-            #logger.debug(f'WU >>> local_ip_query_output: {local_ip_query_output})')
-            local_ip = local_ip_query_output[local_ip_query_output.find('inet ') + 5:
-                                             local_ip_query_output.find('/')]
-
-            if local_ip == '':
+            local_ip = get_interface_ip(args.interface)
+        except OSError as error:
+            if error.errno == errno.EADDRNOTAVAIL:
                 logger.critical(f'WU >>> Unable to obtain an IP address for {args.interface}. Please retry with a valid interface name.')
-                raise SystemExit(6)
-        except:
-            logger.critical(f'WU >>> Invalid interface {args.interface}. Please retry with a valid interface name.')
+            else:
+                logger.critical(f'WU >>> Invalid interface {args.interface}. Please retry with a valid interface name.')
             raise SystemExit(6)
     else:
         intf = None
@@ -1009,6 +1574,38 @@ if __name__ == "__main__":
     except ValueError:
         logger.critical('WU >>> Invalid destination port specified.')
         raise SystemExit(14)
+
+    if args.cpu_affinity is not None:
+        if hasattr(os, 'sched_setaffinity'):
+            try:
+                cpu_affinity = [int(cpu_core) for cpu_core in args.cpu_affinity.split(',')]
+                logger.debug(f'WU >>> cpu_affinity: {cpu_affinity}')
+
+                if not set(cpu_affinity).issubset(os.sched_getaffinity(0)):
+                    logger.critical('WU >>> Unavailable CPU cores specified for affinity.')
+                    raise SystemExit(21)
+            except ValueError:
+                logger.critical('WU >>> Invalid CPU affinity specified.')
+                raise SystemExit(21)
+
+            # cores on a different NUMA node than the network card will pay for
+            # cross-node memory accesses on every packet, so flag them if possible
+            if args.interface is not None:
+                interface_numa = get_interface_numa_cores(args.interface)
+
+                if interface_numa is not None:
+                    numa_node, numa_cores = interface_numa
+                    logger.debug(f'WU >>> {args.interface} NUMA node {numa_node} cores: {sorted(numa_cores)}')
+                    remote_cores = sorted(set(cpu_affinity) - numa_cores)
+
+                    if remote_cores:
+                        logger.warning((f'WU >>> CPU cores {remote_cores} are not local to NUMA node {numa_node} '
+                                        f'of {args.interface}, which may increase latency.'))
+        else:
+            logger.warning('WU >>> CPU affinity is not supported on this platform and will be ignored.')
+            cpu_affinity = None
+    else:
+        cpu_affinity = None
     #########################################################################################################
 
     # the relay port will be used internally for UDP packet forwarding
@@ -1025,27 +1622,37 @@ if __name__ == "__main__":
         logger.info('WU >>> The Wookiee Unicaster configuration file is absent. Built-in defaults will be used.')
 
     #################### MULTIPROCESS SHARED MEMORY ####################
-    # 'I' = unsigned int
-    remote_peer_port_array = multiprocessing.Array('I', [0] * peers)
-    # 'L' = unsigned long
-    remote_peer_addr_array = multiprocessing.Array('L', [0] * peers)
-    # 'I' = unsigned int
-    max_packet_size = multiprocessing.Value('I', 0)
-    # 'L' = unsigned long
-    source_packet_count = multiprocessing.Value('L', 0)
-    # 'L' = unsigned long
-    destination_packet_count = multiprocessing.Value('L', 0)
+    # 'Q' = unsigned long long, holding both the IP address and port of a remote peer,
+    # which get written/read as a single aligned 64-bit value and thus need no locking
+    remote_peer_addr_array = multiprocessing.RawArray('Q', peers)
+    # one entry for the server handler (P0) and one for each remote peer
+    packet_stats = multiprocessing.RawArray(PacketStats, peers + 1)
     ####################################################################
 
-    source_queue_list = [multiprocessing.Queue(PACKET_QUEUE_SIZE) for peer in range(peers)]
-    destination_queue_list = [multiprocessing.Queue(PACKET_QUEUE_SIZE) for peer in range(peers)]
-    remote_peer_event_list = [multiprocessing.Event() for peer in range(peers)]
+    # only the server needs to queue packets, since it uses a single
+    # catch-all process to receive packets from all remote peers
+    if wookiee_mode == WookieeConstants.WOOKIEE_MODE_SERVER:
+        source_queue_list = [PacketQueue(PACKET_QUEUE_SIZE, RECEIVE_BUFFER_SIZE) for peer in range(peers)]
+    else:
+        source_queue_list = [None] * peers
+    # polled by the server handler on every received packet, hence no (locked) events
+    remote_peer_event_list = [SharedFlag() for peer in range(peers)]
+
+    # worker processes are assigned CPU cores in start order: the server handler
+    # first (if any), followed by the source and destination workers of each peer
+    if cpu_affinity is not None:
+        worker_count = 2 * peers + 1 if wookiee_mode == WookieeConstants.WOOKIEE_MODE_SERVER else 2 * peers
+        if worker_count > len(set(cpu_affinity)):
+            logger.warning('WU >>> Some worker processes will have to share CPU cores.')
+        cpu_cores = itertools.cycle(cpu_affinity)
+    else:
+        cpu_cores = itertools.repeat(None)
 
     ###################### SERVER HANDLER PROCESS ######################
     if wookiee_mode == WookieeConstants.WOOKIEE_MODE_SERVER:
         server_handler = ServerHandler(peers, intf, local_ip, source_port, remote_peer_event_list,
-                                       source_queue_list, remote_peer_addr_array, remote_peer_port_array,
-                                       max_packet_size, source_packet_count, wookiee_constants)
+                                       source_queue_list, remote_peer_addr_array,
+                                       packet_stats, next(cpu_cores), wookiee_constants)
         server_handler_process = server_handler.wookiee_server_handler_start()
     ####################################################################
 
@@ -1066,11 +1673,10 @@ if __name__ == "__main__":
 
         remote_peer_handlers[peer] = RemotePeerHandler(peer + 1, wookiee_mode, intf, local_ip, source_ip,
                                                        destination_ip, source_port, destination_port, relay_port,
-                                                       source_queue_list[peer], destination_queue_list[peer],
-                                                       remote_peer_event_list[peer], remote_peer_handlers_reset_queue,
-                                                       remote_peer_addr_array, remote_peer_port_array, server_socket,
-                                                       max_packet_size, source_packet_count, destination_packet_count,
-                                                       wookiee_constants)
+                                                       source_queue_list[peer], remote_peer_event_list[peer],
+                                                       remote_peer_handlers_reset_queue, remote_peer_addr_array,
+                                                       server_socket, packet_stats,
+                                                       (next(cpu_cores), next(cpu_cores)), wookiee_constants)
 
         remote_peer_handlers_processes[peer] = remote_peer_handlers[peer].wookiee_peer_handler_start()
     ####################################################################
@@ -1129,9 +1735,10 @@ if __name__ == "__main__":
         logger.debug('WU >>> The remote peer handler threads have been stopped.')
 
         logger.info('WU >>> *********************** STATS ***********************')
-        logger.info(f'WU >>> max_packet_size (inbound): {max_packet_size.value}')
-        logger.info(f'WU >>> source_packet_count (inbound): {source_packet_count.value}')
-        logger.info(f'WU >>> destination_packet_count (outbound): {destination_packet_count.value}')
+        logger.info(f'WU >>> max_packet_size (inbound): {max(peer_stats.max_packet_size for peer_stats in packet_stats)}')
+        logger.info(f'WU >>> source_packet_count (inbound): {sum(peer_stats.source_packet_count for peer_stats in packet_stats)}')
+        logger.info(f'WU >>> destination_packet_count (outbound): {sum(peer_stats.destination_packet_count for peer_stats in packet_stats)}')
+        logger.info(f'WU >>> dropped_packet_count (inbound): {sum(peer_stats.dropped_packet_count for peer_stats in packet_stats)}')
         logger.info('WU >>> *********************** STATS ***********************')
 
     logger.info('WU >>> Ruow! (Goodbye)')